@@ -0,0 +1,268 @@
+"""Numba-compiled search kernels shared by the built-in plugins.
+
+Plugin authors don't need this module. It exists so the hot loops of the
+stock algorithms can run on flat NumPy arrays instead of going through the
+`GridProblem` helper methods once per neighbor.
+
+Numba is optional: if it isn't installed, `HAVE_NUMBA` is False and callers
+fall back to their pure-Python implementations.
+"""
+
+from __future__ import annotations
+
+from math import sqrt
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):  # type: ignore[no-redef]
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+# Everything `fastmath=True` enables except nnan/ninf: g-scores use inf as
+# the "not reached yet" sentinel, so comparisons against inf must stay exact.
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+# 8-connected moves, same order as GridProblem.neighbors8 / neighbor_offsets.
+_DC = np.array([1, -1, 0, 0, 1, 1, -1, -1], dtype=np.int64)
+_DR = np.array([0, 0, 1, -1, 1, -1, 1, -1], dtype=np.int64)
+
+
+@njit(cache=True, inline="always")
+def is_blocked(bits, i):
+    """Blocked flag of cell `i` in GridProblem.blocked_bits (LSB-first bitmap)."""
+    return (bits[i >> 3] >> (i & 7)) & 1
+
+
+@njit(cache=True)
+def _heap_push(f_arr, node_arr, size, f, node):
+    """Push (f, node) onto the binary min-heap stored in two parallel arrays.
+
+    Returns the (possibly reallocated) arrays and the new size.
+    """
+    if size == f_arr.shape[0]:
+        grown_f = np.empty(2 * size, dtype=f_arr.dtype)
+        grown_n = np.empty(2 * size, dtype=node_arr.dtype)
+        grown_f[:size] = f_arr
+        grown_n[:size] = node_arr
+        f_arr = grown_f
+        node_arr = grown_n
+
+    i = size
+    while i > 0:
+        parent = (i - 1) >> 1
+        if f_arr[parent] <= f:
+            break
+        f_arr[i] = f_arr[parent]
+        node_arr[i] = node_arr[parent]
+        i = parent
+    f_arr[i] = f
+    node_arr[i] = node
+    return f_arr, node_arr, size + 1
+
+
+@njit(cache=True)
+def _heap_pop(f_arr, node_arr, size):
+    """Pop the smallest entry. Returns (f, node, new_size); size must be > 0."""
+    f_top = f_arr[0]
+    node_top = node_arr[0]
+    size -= 1
+    if size > 0:
+        f_last = f_arr[size]
+        node_last = node_arr[size]
+        i = 0
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and f_arr[child + 1] < f_arr[child]:
+                child += 1
+            if f_arr[child] >= f_last:
+                break
+            f_arr[i] = f_arr[child]
+            node_arr[i] = node_arr[child]
+            i = child
+        f_arr[i] = f_last
+        node_arr[i] = node_last
+    return f_top, node_top, size
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def astar_core(
+    width, height, cell_size, blocked_bits, cost_mult_f32, offsets, dists, start, goal, min_mult, max_visited
+):
+    """A* over the flat grid arrays.
+
+    Same semantics as the pure-Python `plugins/astar.py` loop: 8-connected,
+    edge cost = step distance * multiplier of the target cell, Euclidean
+    heuristic scaled by `min_mult`, nodes re-opened if their g improves.
+    `offsets`/`dists` are GridProblem.neighbor_offsets/neighbor_dists and
+    `blocked_bits` is GridProblem.blocked_bits.
+
+    Returns (came_from, g_goal, expanded, visited) where `visited` holds the
+    first `max_visited` expanded cells.
+    """
+    return _astar_search(
+        width, height, blocked_bits, cost_mult_f32, offsets, dists, start, goal,
+        cell_size * min_mult, max_visited, np.inf,
+    )
+
+
+@njit(cache=True)
+def astar_fixed_core(width, height, blocked_bits, mult_q8, offsets, dists_q, start, goal, h_scale_q, max_visited):
+    """Fixed-point variant of `astar_core`.
+
+    g-scores are int64 in units of dist_q * mult_q8 (so with distances in mm
+    and multipliers in 1/256 steps, 1/256 mm); edge costs are a single
+    integer multiply. `dists_q` are the 8 step distances in the same integer
+    units as `offsets`, and `h_scale_q` must not overestimate a straight-line
+    step in g units. Unreached cells hold INT64_MAX.
+
+    Returns (came_from, g_goal, expanded, visited) like `astar_core`.
+    """
+    return _astar_search(
+        width, height, blocked_bits, mult_q8, offsets, dists_q, start, goal,
+        h_scale_q, max_visited, np.iinfo(np.int64).max,
+    )
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _astar_search(width, height, blocked_bits, mult, offsets, dists, start, goal, h_scale, max_visited, unreached):
+    """Loop shared by `astar_core` and `astar_fixed_core`.
+
+    Numba compiles it once per dtype combination: g takes the type of
+    `unreached` (float64 inf or int64 max), and edge costs are
+    `dists[k] * mult[nxt]` in whatever type that product has.
+    """
+    n = width * height
+    g = np.full(n, unreached)
+    came_from = np.full(n, -1, dtype=np.int32)
+    closed = np.zeros(n, dtype=np.uint8)
+    visited = np.empty(max_visited, dtype=np.int32)
+    n_visited = 0
+
+    goal_col = goal % width
+    goal_row = goal // width
+
+    f_arr = np.empty(64, dtype=np.float64)
+    node_arr = np.empty(64, dtype=np.int32)
+    size = 0
+
+    dx = start % width - goal_col
+    dy = start // width - goal_row
+    g[start] = 0
+    came_from[start] = start
+    f_arr, node_arr, size = _heap_push(f_arr, node_arr, size, h_scale * sqrt(dx * dx + dy * dy), start)
+
+    expanded = 0
+    while size > 0:
+        _f, cur, size = _heap_pop(f_arr, node_arr, size)
+        if closed[cur]:
+            continue
+        closed[cur] = 1
+
+        expanded += 1
+        if n_visited < max_visited:
+            visited[n_visited] = cur
+            n_visited += 1
+
+        if cur == goal:
+            break
+
+        col = cur % width
+        row = cur // width
+        interior = 0 < col < width - 1 and 0 < row < height - 1
+        g_cur = g[cur]
+        for k in range(8):
+            if interior:
+                nxt = cur + offsets[k]
+            else:
+                c = col + _DC[k]
+                r = row + _DR[k]
+                if c < 0 or c >= width or r < 0 or r >= height:
+                    continue
+                nxt = r * width + c
+            if is_blocked(blocked_bits, nxt):
+                continue
+            ng = g_cur + dists[k] * mult[nxt]
+            if ng < g[nxt]:
+                g[nxt] = ng
+                came_from[nxt] = cur
+                closed[nxt] = 0
+                dx = nxt % width - goal_col
+                dy = nxt // width - goal_row
+                f_arr, node_arr, size = _heap_push(
+                    f_arr, node_arr, size, ng + h_scale * sqrt(dx * dx + dy * dy), nxt
+                )
+
+    return came_from, g[goal], expanded, visited[:n_visited]
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def los_cost_core(x0, y0, x1, y1, width, height, blocked_u8, cost_mult_f32, cell_size):
+    """Line of sight and weighted cost from cell (x0, y0) to (x1, y1).
+
+    Walks the same integer Bresenham line as Theta*'s `_bresenham_cells`,
+    checking blocking and accumulating `step_distance * multiplier` in the
+    same pass. Returns (has_los, cost); cost is inf when there is no LOS.
+    """
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx - dy
+    diag = cell_size * 2**0.5
+
+    x = x0
+    y = y0
+    if x < 0 or x >= width or y < 0 or y >= height or blocked_u8[y * width + x]:
+        return False, np.inf
+
+    total = 0.0
+    while x != x1 or y != y1:
+        e2 = 2 * err
+        moved_x = e2 > -dy
+        moved_y = e2 < dx
+        if moved_x:
+            err -= dy
+            x += sx
+        if moved_y:
+            err += dx
+            y += sy
+        if x < 0 or x >= width or y < 0 or y >= height:
+            return False, np.inf
+        cid = y * width + x
+        if blocked_u8[cid]:
+            return False, np.inf
+        total += (diag if moved_x and moved_y else cell_size) * cost_mult_f32[cid]
+    return True, total
+
+
+@njit(cache=True)
+def reconstruct_core(came_from, start, goal):
+    """Follow `came_from` back from goal to start into a preallocated buffer.
+
+    Returns the start -> goal path as an int32 array, or an empty array if
+    the chain is broken (or loops without reaching start).
+    """
+    n = came_from.shape[0]
+    buf = np.empty(n, dtype=np.int32)
+    idx = 0
+    cur = goal
+    while True:
+        buf[idx] = cur
+        idx += 1
+        if cur == start:
+            break
+        cur = came_from[cur]
+        if cur < 0 or idx >= n:
+            return buf[:0]
+    return buf[:idx][::-1].copy()
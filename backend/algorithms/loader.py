@@ -1,30 +1,74 @@
 from __future__ import annotations
 
 import importlib
+import os
 import pkgutil
-from dataclasses import dataclass
-from typing import Callable, Dict, List
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import astuple, dataclass, replace
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple, Union
 
-from .types import AlgorithmResult, AlgorithmSpec, GridProblem, RunOptions
+import numpy as np
 
+from .types import AlgorithmError, AlgorithmResult, AlgorithmSpec, GridBoundsMeters, GridProblem, RunOptions
 
-@dataclass
+
+RunFn = Callable[[GridProblem, RunOptions], AlgorithmResult]
+RunOutcome = Union[AlgorithmResult, AlgorithmError]
+
+
+@dataclass(slots=True)
 class LoadedAlgorithm:
     spec: AlgorithmSpec
-    run: Callable[[GridProblem, RunOptions], AlgorithmResult]
+    run: RunFn
+
+
+# Results kept for `RunOptions(cache=True)` runs, least recently used first.
+RESULT_CACHE_SIZE: int = 64
+_results: OrderedDict[Tuple, AlgorithmResult] = OrderedDict()
+_results_lock = threading.Lock()
+
+_PLUGINS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plugins')
+
+# (plugin file signature, registry, specs sorted by id) from the last discovery.
+_cache: Optional[Tuple[FrozenSet[Tuple[str, int]], Dict[str, LoadedAlgorithm], List[AlgorithmSpec]]] = None
+
 
+def _plugins_signature() -> FrozenSet[Tuple[str, int]]:
+    return frozenset(
+        (f.name, f.stat().st_mtime_ns)
+        for f in os.scandir(_PLUGINS_DIR)
+        if f.name.endswith('.py')
+    )
 
-def load_plugins() -> Dict[str, LoadedAlgorithm]:
+
+def load_plugins(force: bool = False) -> Dict[str, LoadedAlgorithm]:
     """Discover and import all algorithms from backend/algorithms/plugins.
 
     Each plugin module must define:
       - ALGORITHM: AlgorithmSpec
       - run(problem: GridProblem, options: RunOptions) -> AlgorithmResult
 
+    The result is cached for the life of the process and only rebuilt when a
+    plugin file is added, removed or touched (or when `force=True`).
+
     Returns
     -------
     dict mapping algorithm_id -> LoadedAlgorithm
     """
+    global _cache
+
+    sig = _plugins_signature()
+    if not force and _cache is not None and _cache[0] == sig:
+        return _cache[1]
+    # Files that changed since the last discovery must be re-executed;
+    # import_module alone would hand back the stale module from sys.modules.
+    stale = {name[:-3] for name, _mtime in sig - _cache[0]} if _cache is not None else set()
+    if stale:
+        clear_result_cache()
 
     registry: Dict[str, LoadedAlgorithm] = {}
 
@@ -36,7 +80,11 @@ def load_plugins() -> Dict[str, LoadedAlgorithm]:
     for m in pkgutil.iter_modules(package.__path__):
         if m.name.startswith('_'):
             continue
-        module = importlib.import_module(f"{package_name}.{m.name}")
+        module_name = f"{package_name}.{m.name}"
+        if m.name in stale and module_name in sys.modules:
+            module = importlib.reload(sys.modules[module_name])
+        else:
+            module = importlib.import_module(module_name)
         spec = getattr(module, 'ALGORITHM', None)
         run_fn = getattr(module, 'run', None)
         if spec is None or run_fn is None:
@@ -45,10 +93,102 @@ def load_plugins() -> Dict[str, LoadedAlgorithm]:
             raise TypeError(f"Plugin {m.name} ALGORITHM must be AlgorithmSpec")
         if spec.id in registry:
             raise ValueError(f"Duplicate algorithm id: {spec.id}")
-        registry[spec.id] = LoadedAlgorithm(spec=spec, run=run_fn)
+        registry[spec.id] = LoadedAlgorithm(spec=spec, run=_with_result_cache(spec.id, run_fn))
 
+    _cache = (sig, registry, [registry[k].spec for k in sorted(registry.keys())])
     return registry
 
 
 def list_algorithms(registry: Dict[str, LoadedAlgorithm]) -> List[AlgorithmSpec]:
+    if _cache is not None and registry is _cache[1]:
+        return list(_cache[2])
     return [registry[k].spec for k in sorted(registry.keys())]
+
+
+def warm_up(registry: Dict[str, LoadedAlgorithm]) -> None:
+    """Run every algorithm once on a tiny grid.
+
+    Loads (or, with an empty cache, compiles) the Numba kernels before the
+    first real request, so JIT time never shows up in its runtime_ms. The grid
+    uses the same array dtypes as an API request, so the same compiled
+    signatures are hit. Failures are ignored; a real run will report them.
+    """
+    side = 4
+    n = side * side
+    problem = GridProblem(
+        width=side,
+        height=side,
+        cell_size_m=1.0,
+        bounds=GridBoundsMeters(min_x=0.0, min_y=0.0, max_x=float(side), max_y=float(side)),
+        start=0,
+        goal=n - 1,
+        blocked=np.zeros(n, dtype=np.uint8),
+        cost_multiplier=np.ones(n, dtype=np.float32),
+    )
+    for algo in registry.values():
+        for exact in (True, False):
+            algo.run(problem, RunOptions(return_visited=True, max_visited=n, exact=exact))
+
+
+def warm_up_worker() -> None:
+    """Process-pool initializer: load the plugins and warm them up (see `warm_up`)."""
+    warm_up(load_plugins())
+
+
+def clear_result_cache() -> None:
+    with _results_lock:
+        _results.clear()
+
+
+def _with_result_cache(algo_id: str, run_fn: RunFn) -> RunFn:
+    """Wrap a plugin's `run` with the LRU result cache used when `options.cache` is set.
+
+    The wrapper also takes an optional `executor`: the plugin's own `run`
+    (a module-level function, so it pickles by reference) is then submitted
+    there and waited on, e.g. to search in another process. Cache lookups
+    stay in the calling process.
+    """
+
+    def call(problem: GridProblem, options: RunOptions, executor: Optional[Executor]) -> RunOutcome:
+        if executor is None:
+            return _run_guarded(run_fn, problem, options)
+        return executor.submit(_run_guarded, run_fn, problem, options).result()
+
+    def run(problem: GridProblem, options: RunOptions, executor: Optional[Executor] = None) -> RunOutcome:
+        if not options.cache:
+            return call(problem, options, executor)
+
+        key = (algo_id, problem.cache_key(), astuple(options))
+        with _results_lock:
+            hit = _results.get(key)
+            if hit is not None:
+                _results.move_to_end(key)
+        if hit is None:
+            hit = call(problem, options, executor)
+            if isinstance(hit, AlgorithmError):
+                return hit
+            with _results_lock:
+                _results[key] = hit
+                while len(_results) > RESULT_CACHE_SIZE:
+                    _results.popitem(last=False)
+        # Hand out copies so callers can't mutate the cached lists. A hit
+        # keeps the runtime_ms of the run that produced it.
+        return replace(hit, path=hit.path.copy(), visited=hit.visited.copy())
+
+    return run
+
+
+def _run_guarded(run_fn: RunFn, problem: GridProblem, options: RunOptions) -> RunOutcome:
+    """Call a plugin, turning any exception into an AlgorithmError.
+
+    Also records the call's wall time in `result.runtime_ms`. Timing here,
+    inside the executor, leaves out pickling, IPC and worker start-up.
+    """
+    t0 = time.perf_counter_ns()
+    try:
+        result = run_fn(problem, options)
+    except Exception as e:
+        return AlgorithmError(error_type=type(e).__name__, message=str(e))
+    if isinstance(result, AlgorithmResult):
+        result.runtime_ms = (time.perf_counter_ns() - t0) / 1_000_000
+    return result
@@ -36,6 +36,11 @@ Algorithm contract
   where `cost_multiplier` comes from user-drawn zones. No-fly zones are already
   removed from the neighbor set.
 
+- From the API, `problem.blocked` and `problem.cost_multiplier` are NumPy
+  arrays (uint8/bool and float32), not lists. Indexing them from Python is
+  slow, so in the search loop use `problem.neighbors8_cost(cell_id)` (or
+  `neighbors8`, `is_blocked`, `get_multiplier`) instead.
+
 - Return `path` as a list of **cell ids** (ints) from start→goal, inclusive.
 - If there is no path, return `path=[]` and `cost=inf`.
 - If you want the UI to show explored nodes, put cell ids in `visited`.
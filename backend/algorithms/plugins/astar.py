@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import heapq
-from math import inf
+from math import hypot, inf, isfinite
 
+import numpy as np
+
+from .._numba_core import HAVE_NUMBA, astar_core, astar_fixed_core, reconstruct_core
 from ..types import AlgorithmResult, AlgorithmSpec, GridProblem, RunOptions, reconstruct_path
 
 ALGORITHM = AlgorithmSpec(
@@ -13,47 +16,133 @@ ALGORITHM = AlgorithmSpec(
 
 
 def run(problem: GridProblem, options: RunOptions) -> AlgorithmResult:
+    # Min multiplier used to keep heuristic admissible even if you have encouraged (<1) zones.
+    min_mult = problem.min_multiplier()
+    if not (min_mult > 0) or not isfinite(min_mult):
+        min_mult = 1.0
+
+    if HAVE_NUMBA:
+        if not options.exact and problem.multiplier_q8 is not None and problem.cell_size_m >= 1.0 / DIST_SCALE:
+            return _run_fixed(problem, options)
+        return _run_numba(problem, options, min_mult)
+    return _run_python(problem, options, min_mult)
+
+
+# Fixed-point units for `RunOptions(exact=False)`: step distances in 1/DIST_SCALE m
+# (mm), multipliers in 1/MULT_SCALE steps (see GridProblem.multiplier_q8).
+DIST_SCALE: int = 1000
+MULT_SCALE: int = 256
+
+
+def _visit_cap(problem: GridProblem, options: RunOptions) -> int:
+    """Length of the kernels' visited buffer, capped at the cell count.
+
+    The kernels allocate it up front, so an unchecked client max_visited could
+    ask for an arbitrarily large array.
+    """
+    return min(options.max_visited, problem.size()) if options.return_visited else 0
+
+
+def _run_fixed(problem: GridProblem, options: RunOptions) -> AlgorithmResult:
+    """A* on integer g-scores; costs are exact up to the quantization above."""
+    start = problem.start
+    goal = problem.goal
+    mult_q = problem.multiplier_q8
+    dists_q = np.rint(problem.neighbor_dists * DIST_SCALE).astype(np.int64)
+    # Smallest cost per unit of straight-line distance, so the heuristic stays
+    # admissible under the rounded integer step distances too.
+    min_step_q = min(float(dists_q[0]), float(dists_q[4]) / 2**0.5)
+    h_scale_q = min_step_q * float(mult_q.min())
+
+    came_from, g_goal, expanded, visited = astar_fixed_core(
+        problem.width,
+        problem.height,
+        problem.blocked_bits,
+        mult_q,
+        problem.neighbor_offsets,
+        dists_q,
+        start,
+        goal,
+        h_scale_q,
+        _visit_cap(problem, options),
+    )
+
+    path = reconstruct_core(came_from, start, goal)
+    cost = int(g_goal) / (DIST_SCALE * MULT_SCALE) if path.size else inf
+    return AlgorithmResult(path=path, visited=visited, expanded=int(expanded), cost=cost)
+
+
+def _run_numba(problem: GridProblem, options: RunOptions, min_mult: float) -> AlgorithmResult:
+    start = problem.start
+    goal = problem.goal
+    came_from, g_goal, expanded, visited = astar_core(
+        problem.width,
+        problem.height,
+        float(problem.cell_size_m),
+        problem.blocked_bits,
+        problem.multiplier_f32,
+        problem.neighbor_offsets,
+        problem.neighbor_dists,
+        start,
+        goal,
+        float(min_mult),
+        _visit_cap(problem, options),
+    )
+
+    # Path and visited stay int32 arrays; the API serializes them as-is.
+    path = reconstruct_core(came_from, start, goal)
+    cost = float(g_goal) if path.size else inf
+    return AlgorithmResult(path=path, visited=visited, expanded=int(expanded), cost=cost)
+
+
+def _run_python(problem: GridProblem, options: RunOptions, min_mult: float) -> AlgorithmResult:
     n = problem.size()
     start = problem.start
     goal = problem.goal
 
-    # Min multiplier used to keep heuristic admissible even if you have encouraged (<1) zones.
-    try:
-        min_mult = min(problem.cost_multiplier)
-        if not (min_mult > 0):
-            min_mult = 1.0
-    except Exception:
-        min_mult = 1.0
+    # Heuristic inlined below: h(cell) = cell_size * hypot(dcol, drow) * min_mult.
+    width = problem.width
+    goal_col, goal_row = problem.to_row_col(goal)
+    h_scale = problem.cell_size_m * min_mult
 
     g = [inf] * n
     g[start] = 0.0
     came_from = [-1] * n
+    came_from[start] = start
+    # Stale heap entries are skipped via `closed` rather than by carrying g in
+    # every entry; a node is re-opened whenever its g improves.
+    closed = [False] * n
 
-    # (f, g, node)
-    pq: list[tuple[float, float, int]] = [(problem.heuristic_euclidean_m(start, min_mult), 0.0, start)]
+    # (f, node)
+    pq: list[tuple[float, int]] = [(problem.heuristic_euclidean_m(start, min_mult), start)]
 
     visited_out = []
+    # expanded counts up from 1, so this records exactly the first visit_cap expansions.
+    visit_cap = options.max_visited if options.return_visited else 0
     expanded = 0
 
     while pq:
-        f, cur_g, cur = heapq.heappop(pq)
-        if cur_g != g[cur]:
+        f, cur = heapq.heappop(pq)
+        if closed[cur]:
             continue
+        closed[cur] = True
+        cur_g = g[cur]
 
         expanded += 1
-        if options.return_visited and len(visited_out) < options.max_visited:
+        if expanded <= visit_cap:
             visited_out.append(cur)
 
         if cur == goal:
             break
 
-        for nxt, step_dist in problem.neighbors8(cur):
-            ng = cur_g + problem.step_cost(nxt, step_dist)
+        for nxt, _step_dist, edge_cost in problem.neighbors8_cost(cur):
+            ng = cur_g + edge_cost
             if ng < g[nxt]:
                 g[nxt] = ng
                 came_from[nxt] = cur
-                h = problem.heuristic_euclidean_m(nxt, min_mult)
-                heapq.heappush(pq, (ng + h, ng, nxt))
+                closed[nxt] = False
+                row, col = divmod(nxt, width)
+                heapq.heappush(pq, (ng + h_scale * hypot(col - goal_col, row - goal_row), nxt))
 
     path = reconstruct_path(came_from, start, goal)
     cost = g[goal] if path else inf
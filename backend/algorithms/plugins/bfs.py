@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from array import array
 from collections import deque
 from math import inf
 
@@ -17,18 +18,23 @@ def run(problem: GridProblem, options: RunOptions) -> AlgorithmResult:
     start = problem.start
     goal = problem.goal
 
-    came_from = [-1] * n
-    visited_flags = [False] * n
+    # Compact per-cell state: 4 bytes per parent and 1 byte per flag instead of
+    # a list slot (plus an int object) per cell.
+    came_from = array("i", [-1]) * n
+    came_from[start] = start
+    visited_flags = bytearray(n)
     q = deque([start])
-    visited_flags[start] = True
+    visited_flags[start] = 1
 
     visited_out = []
+    # expanded counts up from 1, so this records exactly the first visit_cap expansions.
+    visit_cap = options.max_visited if options.return_visited else 0
     expanded = 0
 
     while q:
         cur = q.popleft()
         expanded += 1
-        if options.return_visited and len(visited_out) < options.max_visited:
+        if expanded <= visit_cap:
             visited_out.append(cur)
 
         if cur == goal:
@@ -37,7 +43,7 @@ def run(problem: GridProblem, options: RunOptions) -> AlgorithmResult:
         for nxt, _dist in problem.neighbors8(cur):
             if visited_flags[nxt]:
                 continue
-            visited_flags[nxt] = True
+            visited_flags[nxt] = 1
             came_from[nxt] = cur
             q.append(nxt)
 
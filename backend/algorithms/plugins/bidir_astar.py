@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import heapq
+from math import hypot, inf, isfinite
+
+from ..types import AlgorithmResult, AlgorithmSpec, GridProblem, RunOptions, reconstruct_path
+
+ALGORITHM = AlgorithmSpec(
+    id="bidir-astar",
+    name="Bidirectional A*",
+    description="A* searching from start and goal at once; stops when the frontiers prove the best meeting point.",
+)
+
+
+def run(problem: GridProblem, options: RunOptions) -> AlgorithmResult:
+    n = problem.size()
+    start = problem.start
+    goal = problem.goal
+    width = problem.width
+
+    if start == goal:
+        return AlgorithmResult(
+            path=[start],
+            visited=[start] if options.return_visited else [],
+            expanded=0,
+            cost=0.0,
+        )
+    if problem.is_blocked(goal):
+        return AlgorithmResult(path=[], visited=[], expanded=0, cost=inf)
+
+    # Min multiplier used to keep both heuristics admissible even if you have encouraged (<1) zones.
+    min_mult = problem.min_multiplier()
+    if not (min_mult > 0) or not isfinite(min_mult):
+        min_mult = 1.0
+    h_scale = problem.cell_size_m * min_mult
+
+    start_col, start_row = problem.to_row_col(start)
+    goal_col, goal_row = problem.to_row_col(goal)
+
+    def h_fwd(cell_id: int) -> float:
+        row, col = divmod(cell_id, width)
+        return h_scale * hypot(col - goal_col, row - goal_row)
+
+    def h_bwd(cell_id: int) -> float:
+        row, col = divmod(cell_id, width)
+        return h_scale * hypot(col - start_col, row - start_row)
+
+    # Forward search: g_fwd[v] = cost start -> v, came_fwd points back towards start.
+    # Backward search: g_bwd[v] = cost v -> goal, came_bwd points on towards goal.
+    g_fwd = [inf] * n
+    g_bwd = [inf] * n
+    came_fwd = [-1] * n
+    came_bwd = [-1] * n
+    came_fwd[start] = start
+    came_bwd[goal] = goal
+    g_fwd[start] = 0.0
+    g_bwd[goal] = 0.0
+
+    # (f, g, node)
+    pq_fwd: list[tuple[float, float, int]] = [(h_fwd(start), 0.0, start)]
+    pq_bwd: list[tuple[float, float, int]] = [(h_bwd(goal), 0.0, goal)]
+
+    best = inf
+    meet = -1
+    visited_out = []
+    # expanded counts up from 1, so this records exactly the first visit_cap expansions.
+    visit_cap = options.max_visited if options.return_visited else 0
+    expanded = 0
+
+    while pq_fwd and pq_bwd:
+        # Every start->goal path not found yet must pass through both open
+        # lists, so it costs at least the top f of each frontier (and hence the
+        # larger of the two); once that reaches `best`, `best` is optimal.
+        top_fwd = pq_fwd[0][0]
+        top_bwd = pq_bwd[0][0]
+        if max(top_fwd, top_bwd) >= best:
+            break
+
+        forward = top_fwd <= top_bwd
+        if forward:
+            _f, cur_g, cur = heapq.heappop(pq_fwd)
+            if cur_g != g_fwd[cur]:
+                continue
+        else:
+            _f, cur_g, cur = heapq.heappop(pq_bwd)
+            if cur_g != g_bwd[cur]:
+                continue
+
+        expanded += 1
+        if expanded <= visit_cap:
+            visited_out.append(cur)
+
+        if forward:
+            for nxt, _step_dist, edge_cost in problem.neighbors8_cost(cur):
+                ng = cur_g + edge_cost
+                if ng < g_fwd[nxt]:
+                    g_fwd[nxt] = ng
+                    came_fwd[nxt] = cur
+                    heapq.heappush(pq_fwd, (ng + h_fwd(nxt), ng, nxt))
+                    if ng + g_bwd[nxt] < best:
+                        best = ng + g_bwd[nxt]
+                        meet = nxt
+        else:
+            # Walking edges in reverse: the edge prv -> cur is charged the multiplier of cur.
+            for prv, step_dist in problem.neighbors8(cur):
+                ng = cur_g + problem.step_cost(cur, step_dist)
+                if ng < g_bwd[prv]:
+                    g_bwd[prv] = ng
+                    came_bwd[prv] = cur
+                    heapq.heappush(pq_bwd, (ng + h_bwd(prv), ng, prv))
+                    if g_fwd[prv] + ng < best:
+                        best = g_fwd[prv] + ng
+                        meet = prv
+
+    if meet == -1:
+        return AlgorithmResult(path=[], visited=visited_out, expanded=expanded, cost=inf)
+
+    head = reconstruct_path(came_fwd, start, meet)
+    tail = reconstruct_path(came_bwd, goal, meet)
+    tail.reverse()
+    path = head + tail[1:] if head and tail else []
+    cost = best if path else inf
+    return AlgorithmResult(path=path, visited=visited_out, expanded=expanded, cost=cost)
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import heapq
 from math import inf
+from typing import Optional, Tuple
+
+import numpy as np
 
 from ..types import AlgorithmResult, AlgorithmSpec, GridProblem, RunOptions, reconstruct_path
 
@@ -11,8 +14,98 @@ ALGORITHM = AlgorithmSpec(
     description="Optimal shortest path w.r.t. step distance * cost multiplier.",
 )
 
+# Use a bucket queue (Dial's algorithm) when the largest edge weight is at most
+# this many times the smallest; otherwise fall back to the binary heap.
+MAX_BUCKETS: int = 4096
+
 
 def run(problem: GridProblem, options: RunOptions) -> AlgorithmResult:
+    layout = _bucket_layout(problem)
+    if layout is not None:
+        return _run_buckets(problem, options, *layout)
+    return _run_heap(problem, options)
+
+
+def _bucket_layout(problem: GridProblem) -> Optional[Tuple[float, int]]:
+    """Return (bucket_width, bucket_count) for the bucket queue, or None.
+
+    Buckets are `bucket_width` wide in path cost, and bucket_width is just
+    under the smallest possible edge weight. Relaxing any node therefore
+    lands strictly in a later bucket, so every node in the lowest non-empty
+    bucket already has its final distance. The result is exact Dijkstra
+    with no cost quantization. The buckets form a ring: pending entries
+    never span more than the largest edge weight.
+    """
+    mult = np.asarray(problem.cost_multiplier, dtype=np.float64)
+    if mult.size == 0:
+        return None
+    # Same sanitizing as GridProblem.get_multiplier.
+    mult = np.where(np.isfinite(mult) & (mult > 0), mult, 1.0)
+    min_edge = problem.cell_size_m * float(mult.min())
+    max_edge = problem.cell_size_m * 2**0.5 * float(mult.max())
+    if not (min_edge > 0) or max_edge / min_edge > MAX_BUCKETS:
+        return None
+
+    # Stay clear of rounding in int(d / bucket_width) right at a bucket edge.
+    bucket_width = min_edge * (1.0 - 1e-6)
+    return bucket_width, int(max_edge / bucket_width) + 3
+
+
+def _run_buckets(problem: GridProblem, options: RunOptions, bucket_width: float, n_buckets: int) -> AlgorithmResult:
+    n = problem.size()
+    start = problem.start
+    goal = problem.goal
+
+    dist = [inf] * n
+    dist[start] = 0.0
+    came_from = [-1] * n
+    came_from[start] = start
+    settled = [False] * n
+
+    buckets: list[list[int]] = [[] for _ in range(n_buckets)]
+    buckets[0].append(start)
+    pending = 1
+    cur_bucket = 0
+
+    visited_out = []
+    # expanded counts up from 1, so this records exactly the first visit_cap expansions.
+    visit_cap = options.max_visited if options.return_visited else 0
+    expanded = 0
+
+    while pending:
+        bucket = buckets[cur_bucket % n_buckets]
+        if not bucket:
+            cur_bucket += 1
+            continue
+        cur = bucket.pop()
+        pending -= 1
+        # Stale entry: the node was re-queued in an earlier bucket and settled there.
+        if settled[cur]:
+            continue
+        settled[cur] = True
+
+        expanded += 1
+        if expanded <= visit_cap:
+            visited_out.append(cur)
+
+        if cur == goal:
+            break
+
+        d = dist[cur]
+        for nxt, _step_dist, edge_cost in problem.neighbors8_cost(cur):
+            nd = d + edge_cost
+            if nd < dist[nxt]:
+                dist[nxt] = nd
+                came_from[nxt] = cur
+                buckets[int(nd / bucket_width) % n_buckets].append(nxt)
+                pending += 1
+
+    path = reconstruct_path(came_from, start, goal)
+    cost = dist[goal] if path else inf
+    return AlgorithmResult(path=path, visited=visited_out, expanded=expanded, cost=cost)
+
+
+def _run_heap(problem: GridProblem, options: RunOptions) -> AlgorithmResult:
     n = problem.size()
     start = problem.start
     goal = problem.goal
@@ -20,9 +113,12 @@ def run(problem: GridProblem, options: RunOptions) -> AlgorithmResult:
     dist = [inf] * n
     dist[start] = 0.0
     came_from = [-1] * n
+    came_from[start] = start
 
     pq: list[tuple[float, int]] = [(0.0, start)]
     visited_out = []
+    # expanded counts up from 1, so this records exactly the first visit_cap expansions.
+    visit_cap = options.max_visited if options.return_visited else 0
     expanded = 0
 
     while pq:
@@ -30,14 +126,14 @@ def run(problem: GridProblem, options: RunOptions) -> AlgorithmResult:
         if d != dist[cur]:
             continue
         expanded += 1
-        if options.return_visited and len(visited_out) < options.max_visited:
+        if expanded <= visit_cap:
             visited_out.append(cur)
 
         if cur == goal:
             break
 
-        for nxt, step_dist in problem.neighbors8(cur):
-            nd = d + problem.step_cost(nxt, step_dist)
+        for nxt, _step_dist, edge_cost in problem.neighbors8_cost(cur):
+            nd = d + edge_cost
             if nd < dist[nxt]:
                 dist[nxt] = nd
                 came_from[nxt] = cur
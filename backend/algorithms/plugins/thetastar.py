@@ -17,23 +17,32 @@ Tuning (top-of-file)
 - UTURN_MULT: extra multiplier if the turn angle is very large (near U-turn).
 - UTURN_THRESHOLD_RAD: threshold angle (radians) above which UTURN_MULT applies.
 
+The penalty is TURN_WEIGHT * chord^TURN_POWER, where chord = 2*sin(theta/2) =
+sqrt(2 - 2*cos(theta)) is the distance between the two unit headings. It
+tracks theta closely for gentle turns (90 deg: 1.41 vs 1.57, 180 deg: 2 vs pi)
+and needs no acos, so TURN_WEIGHT keeps roughly its old meaning. Set
+options.turn_exact to use TURN_WEIGHT * theta^TURN_POWER instead.
+
 Override via options (optional)
 -------------------------------
-If your RunOptions supports arbitrary fields, you can override:
+RunOptions (and the API's "options" object) can override the defaults above;
+None keeps the default:
 - options.turn_weight
 - options.turn_power
 - options.u_turn_mult
 - options.u_turn_threshold_rad
+- options.turn_exact
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 from heapq import heappop, heappush
-from math import acos, inf, sqrt
-from typing import Dict, List, Tuple
+from math import acos, cos, hypot, inf, isfinite, sqrt
+from typing import List, Tuple
 
-from ..types import AlgorithmResult, AlgorithmSpec, GridProblem, RunOptions
+from .._numba_core import HAVE_NUMBA, los_cost_core
+from ..types import AlgorithmResult, AlgorithmSpec, GridProblem, RunOptions, reconstruct_path
 
 ALGORITHM = AlgorithmSpec(
     id="theta-star",
@@ -82,78 +91,106 @@ def run(problem: GridProblem, options: RunOptions) -> AlgorithmResult:
     # Heuristic scaling: use minimum cost multiplier to keep it admissible.
     min_mult = _safe_min_multiplier(problem)
 
-    def heuristic(a: int, b: int) -> float:
-        ax, ay = _cell_center_m(problem, a, cell_size)
-        bx, by = _cell_center_m(problem, b, cell_size)
-        dx = ax - bx
-        dy = ay - by
-        return sqrt(dx * dx + dy * dy) * min_mult
+    # Per-cell lookup tables as plain lists: element access from Python is
+    # much cheaper on a list than on a NumPy array.
+    col_of: List[int] = problem.col_of.tolist()
+    row_of: List[int] = problem.row_of.tolist()
+    cx_of: List[float] = problem.cx_of.tolist()
+    cy_of: List[float] = problem.cy_of.tolist()
+
+    goal_x = cx_of[goal]
+    goal_y = cy_of[goal]
 
-    # g-score and parent pointers
-    g: Dict[int, float] = {start: 0.0}
-    parent: Dict[int, int] = {start: start}
+    # g-score, parent pointers and closed flags, indexed by cell id
+    n = problem.size()
+    g: List[float] = [inf] * n
+    parent: List[int] = [-1] * n
+    closed: List[bool] = [False] * n
+    g[start] = 0.0
+    parent[start] = start
 
     # priority queue: (f, g, node)
     open_heap: List[Tuple[float, float, int]] = []
-    heappush(open_heap, (heuristic(start, goal), 0.0, start))
+    heappush(open_heap, (hypot(cx_of[start] - goal_x, cy_of[start] - goal_y) * min_mult, 0.0, start))
 
-    closed: set[int] = set()
     visited_out: List[int] = []
+    # expanded counts up from 1, so this records exactly the first visit_cap expansions.
+    visit_cap = options.max_visited if options.return_visited else 0
     expanded = 0
 
-    # Pull tuning knobs (options override top-of-file defaults if present)
-    turn_weight = float(getattr(options, "turn_weight", TURN_WEIGHT))
-    turn_power = float(getattr(options, "turn_power", TURN_POWER))
-    uturn_mult = float(getattr(options, "u_turn_mult", UTURN_MULT))
-    uturn_thresh = float(getattr(options, "u_turn_threshold_rad", UTURN_THRESHOLD_RAD))
+    # Pull tuning knobs (options override top-of-file defaults if set)
+    turn_weight = TURN_WEIGHT if options.turn_weight is None else float(options.turn_weight)
+    turn_power = TURN_POWER if options.turn_power is None else float(options.turn_power)
+    uturn_mult = UTURN_MULT if options.u_turn_mult is None else float(options.u_turn_mult)
+    uturn_thresh = UTURN_THRESHOLD_RAD
+    if options.u_turn_threshold_rad is not None:
+        uturn_thresh = float(options.u_turn_threshold_rad)
+    turn_exact = options.turn_exact
+    # theta >= threshold  <=>  cos(theta) <= cos(threshold), for thresholds in [0, pi].
+    uturn_cos = cos(uturn_thresh)
+
+    # Turn penalties between single grid steps, turn_pen[dir_in][dir_out] with
+    # directions encoded by _dir_index. Only LOS segments need the full formula.
+    turn_pen = _turn_penalty_table(turn_weight, turn_power, uturn_mult, uturn_cos, turn_exact)
 
     while open_heap:
         f_cur, g_cur, s = heappop(open_heap)
-        if s in closed:
+        if closed[s]:
             continue
 
-        closed.add(s)
+        closed[s] = True
         expanded += 1
 
-        if options.return_visited and len(visited_out) < options.max_visited:
+        if expanded <= visit_cap:
             visited_out.append(s)
 
         if s == goal:
-            path = _reconstruct_path(parent, start, goal)
+            # Parent pointers can skip nodes; UI accepts this node chain.
+            path = reconstruct_path(parent, start, goal)
             return AlgorithmResult(path=path, visited=visited_out, expanded=expanded, cost=g[s])
 
-        ps = parent.get(s, s)
+        ps = parent[s]
+        s_col = col_of[s]
+        s_row = row_of[s]
+        dc_in = s_col - col_of[ps]
+        dr_in = s_row - row_of[ps]
+        if -1 <= dc_in <= 1 and -1 <= dr_in <= 1:
+            pen_from_in = turn_pen[_dir_index(dc_in, dr_in)]
+        else:
+            pen_from_in = None  # parent is a LOS jump, not a grid step
 
         # Expand to 8-connected neighbors
-        for s2, _unused_step_dist in problem.neighbors8(s):
-            if s2 in closed:
+        for s2, _step_dist, base_cost in problem.neighbors8_cost(s):
+            if closed[s2]:
                 continue
 
             # Baseline: connect s -> s2
-            step_dist = _neighbor_step_distance(problem, s, s2, cell_size)
-            base_cost = float(problem.step_cost(s2, step_dist))
-            base_turn_pen = _turn_penalty(problem, parent.get(s, s), s, s2, cell_size,
-                                          turn_weight, turn_power, uturn_mult, uturn_thresh)
+            if pen_from_in is not None:
+                base_turn_pen = pen_from_in[_dir_index(col_of[s2] - s_col, row_of[s2] - s_row)]
+            else:
+                base_turn_pen = _turn_penalty(cx_of, cy_of, ps, s, s2,
+                                              turn_weight, turn_power, uturn_mult, uturn_cos, turn_exact)
             best_parent = s
             best_tentative = g[s] + base_cost + base_turn_pen
 
             # Theta* rewiring attempt: connect parent[s] -> s2 if LOS exists
             # (skip s if possible)
             if ps != s:
-                has_los, los_cost = _los_cost(problem, ps, s2, cell_size)
+                has_los, los_cost = _los_cost(problem, col_of, row_of, ps, s2, cell_size)
                 if has_los:
-                    los_turn_pen = _turn_penalty(problem, parent.get(ps, ps), ps, s2, cell_size,
-                                                 turn_weight, turn_power, uturn_mult, uturn_thresh)
+                    los_turn_pen = _turn_penalty(cx_of, cy_of, parent[ps], ps, s2,
+                                                 turn_weight, turn_power, uturn_mult, uturn_cos, turn_exact)
                     cand = g[ps] + los_cost + los_turn_pen
                     if cand < best_tentative:
                         best_tentative = cand
                         best_parent = ps
 
             # Relaxation
-            if best_tentative < g.get(s2, inf):
+            if best_tentative < g[s2]:
                 g[s2] = best_tentative
                 parent[s2] = best_parent
-                heappush(open_heap, (best_tentative + heuristic(s2, goal), best_tentative, s2))
+                h = hypot(cx_of[s2] - goal_x, cy_of[s2] - goal_y) * min_mult
+                heappush(open_heap, (best_tentative + h, best_tentative, s2))
 
     return AlgorithmResult(
         path=[],
@@ -169,72 +206,36 @@ def run(problem: GridProblem, options: RunOptions) -> AlgorithmResult:
 
 def _safe_min_multiplier(problem: GridProblem) -> float:
     """
-    Best-effort min multiplier to keep heuristic admissible.
-    Falls back to 1.0 if unavailable.
+    Min multiplier to keep heuristic admissible.
+    Falls back to 1.0 if it is not a finite positive number.
     """
-    try:
-        # cost_multiplier is typically a list/array of floats indexed by cell_id.
-        mm = float(min(problem.cost_multiplier))  # type: ignore[arg-type]
-        if mm <= 0:
-            return 1.0
-        return mm
-    except Exception:
+    mm = problem.min_multiplier()
+    if not (mm > 0) or not isfinite(mm):
         return 1.0
+    return mm
 
 
-def _reconstruct_path(parent: Dict[int, int], start: int, goal: int) -> List[int]:
-    # Parent pointers can skip nodes; UI accepts this node chain.
-    path: List[int] = []
-    cur = goal
-    guard = 0
-    while True:
-        path.append(cur)
-        if cur == start:
-            break
-        nxt = parent.get(cur, cur)
-        if nxt == cur:
-            return []
-        cur = nxt
-        guard += 1
-        if guard > 5_000_000:
-            return []
-    path.reverse()
-    return path
-
-
-def _neighbor_step_distance(problem: GridProblem, a: int, b: int, cell_size: float) -> float:
-    ar, ac = problem.to_row_col(a)
-    br, bc = problem.to_row_col(b)
-    dr = abs(br - ar)
-    dc = abs(bc - ac)
+def _neighbor_step_distance(
+    col_of: List[int], row_of: List[int], a: int, b: int, cell_size: float
+) -> float:
+    dr = abs(row_of[b] - row_of[a])
+    dc = abs(col_of[b] - col_of[a])
     if dr == 1 and dc == 1:
         return cell_size * SQRT2
     return cell_size
 
 
-def _cell_center_m(problem: GridProblem, cell_id: int, cell_size: float) -> Tuple[float, float]:
-    """
-    Prefer problem.cell_center_m(cell_id) if it exists, otherwise derive from row/col.
-    """
-    fn = getattr(problem, "cell_center_m", None)
-    if callable(fn):
-        x, y = fn(cell_id)
-        return float(x), float(y)
-
-    r, c = problem.to_row_col(cell_id)
-    return (float(c) + 0.5) * cell_size, (float(r) + 0.5) * cell_size
-
-
 def _turn_penalty(
-    problem: GridProblem,
+    cx_of: List[float],
+    cy_of: List[float],
     a: int,
     b: int,
     c: int,
-    cell_size: float,
     turn_weight: float,
     turn_power: float,
     uturn_mult: float,
-    uturn_threshold_rad: float,
+    uturn_cos: float,
+    exact: bool,
 ) -> float:
     """
     Penalize heading changes for a -> b -> c.
@@ -246,41 +247,108 @@ def _turn_penalty(
     if a == b or b == c:
         return 0.0
 
-    ax, ay = _cell_center_m(problem, a, cell_size)
-    bx, by = _cell_center_m(problem, b, cell_size)
-    cx, cy = _cell_center_m(problem, c, cell_size)
+    return _turn_penalty_vec(
+        cx_of[b] - cx_of[a], cy_of[b] - cy_of[a],
+        cx_of[c] - cx_of[b], cy_of[c] - cy_of[b],
+        turn_weight, turn_power, uturn_mult, uturn_cos, exact,
+    )
+
 
-    v1x, v1y = bx - ax, by - ay
-    v2x, v2y = cx - bx, cy - by
+def _dir_index(dc: int, dr: int) -> int:
+    """Encode a grid step (dc, dr) in {-1, 0, 1}^2 as 0..8 (4 means no move)."""
+    return (dc + 1) * 3 + (dr + 1)
 
-    n1 = sqrt(v1x * v1x + v1y * v1y)
-    n2 = sqrt(v2x * v2x + v2y * v2y)
-    if n1 == 0.0 or n2 == 0.0:
+
+def _turn_penalty_table(
+    turn_weight: float,
+    turn_power: float,
+    uturn_mult: float,
+    uturn_cos: float,
+    exact: bool,
+) -> List[List[float]]:
+    """
+    Precompute _turn_penalty for every pair of grid steps.
+
+    table[_dir_index(in)][_dir_index(out)] is the penalty for stepping `in`
+    then `out`; rows/columns for the "no move" index are 0.
+    """
+    steps = [(dc, dr) for dc in (-1, 0, 1) for dr in (-1, 0, 1)]
+    return [
+        [
+            _turn_penalty_vec(dc1, dr1, dc2, dr2, turn_weight, turn_power, uturn_mult, uturn_cos, exact)
+            for dc2, dr2 in steps
+        ]
+        for dc1, dr1 in steps
+    ]
+
+
+def _turn_penalty_vec(
+    v1x: float,
+    v1y: float,
+    v2x: float,
+    v2y: float,
+    turn_weight: float,
+    turn_power: float,
+    uturn_mult: float,
+    uturn_cos: float,
+    exact: bool,
+) -> float:
+    """Penalty for turning from heading v1 onto heading v2 (see _turn_penalty).
+
+    `uturn_cos` is the cosine of the U-turn threshold angle; `exact` picks
+    theta^power over the chord^power proxy described at the top of the file.
+    """
+    if turn_weight <= 0:
         return 0.0
 
-    cos_theta = (v1x * v2x + v1y * v2y) / (n1 * n2)
-    cos_theta = max(-1.0, min(1.0, cos_theta))
-    theta = acos(cos_theta)
+    # One sqrt of the product keeps straight moves at exactly cos_theta == 1
+    # (sqrt(2) * sqrt(2) would round to just above 2 for diagonals).
+    n1n2 = sqrt((v1x * v1x + v1y * v1y) * (v2x * v2x + v2y * v2y))
+    if n1n2 == 0.0:
+        return 0.0
 
-    # Base penalty: weight * theta^power
-    pen = turn_weight * (theta ** max(0.0, turn_power))
+    cos_theta = (v1x * v2x + v1y * v2y) / n1n2
+    cos_theta = max(-1.0, min(1.0, cos_theta))
+    power = max(0.0, turn_power)
+    if exact:
+        # Base penalty: weight * theta^power
+        pen = turn_weight * (acos(cos_theta) ** power)
+    else:
+        # Base penalty: weight * chord^power, with chord^2 = 2 - 2*cos(theta)
+        chord_sq = 2.0 - 2.0 * cos_theta
+        pen = turn_weight * (chord_sq if power == 2.0 else chord_sq ** (0.5 * power))
 
     # Extra penalty for near U-turns
-    if theta >= uturn_threshold_rad:
+    if cos_theta <= uturn_cos:
         pen *= uturn_mult
 
     return pen
 
 
-def _los_cost(problem: GridProblem, a: int, b: int, cell_size: float) -> Tuple[bool, float]:
+def _los_cost(
+    problem: GridProblem, col_of: List[int], row_of: List[int], a: int, b: int, cell_size: float
+) -> Tuple[bool, float]:
     """
     Returns (has_line_of_sight, cost) from a to b.
 
     LOS exists iff every cell touched by the segment is non-blocked.
     Cost is the sum of weighted per-step costs along the traversed cell sequence:
         step_cost = step_distance_m * cost_multiplier[to_cell]
+
+    Uses the compiled single-pass traversal when numba is available.
     """
-    cells = _bresenham_cells(problem, a, b)
+    if HAVE_NUMBA:
+        return los_cost_core(
+            col_of[a], row_of[a], col_of[b], row_of[b],
+            problem.width, problem.height, problem.blocked_u8, problem.multiplier_f32, cell_size,
+        )
+    return _los_cost_python(problem, col_of, row_of, a, b, cell_size)
+
+
+def _los_cost_python(
+    problem: GridProblem, col_of: List[int], row_of: List[int], a: int, b: int, cell_size: float
+) -> Tuple[bool, float]:
+    cells = _bresenham_cells(problem, col_of, row_of, a, b)
     if not cells:
         return False, inf
 
@@ -292,12 +360,12 @@ def _los_cost(problem: GridProblem, a: int, b: int, cell_size: float) -> Tuple[b
     for i in range(1, len(cells)):
         prev_id = cells[i - 1]
         cur_id = cells[i]
-        step_dist = _neighbor_step_distance(problem, prev_id, cur_id, cell_size)
+        step_dist = _neighbor_step_distance(col_of, row_of, prev_id, cur_id, cell_size)
         total += float(problem.step_cost(cur_id, step_dist))
     return True, total
 
 
-def _bresenham_cells(problem: GridProblem, a: int, b: int) -> List[int]:
+def _bresenham_cells(problem: GridProblem, col_of: List[int], row_of: List[int], a: int, b: int) -> List[int]:
     """
     Enumerate grid cells intersected by the segment from center(a) to center(b),
     using an integer Bresenham traversal over (col,row).
@@ -306,11 +374,8 @@ def _bresenham_cells(problem: GridProblem, a: int, b: int) -> List[int]:
 
     Note: Not a perfect "supercover", but stable and fast for LOS checks + cost integration.
     """
-    ar, ac = problem.to_row_col(a)
-    br, bc = problem.to_row_col(b)
-
-    x0, y0 = ac, ar
-    x1, y1 = bc, br
+    x0, y0 = col_of[a], row_of[a]
+    x1, y1 = col_of[b], row_of[b]
 
     dx = abs(x1 - x0)
     dy = abs(y1 - y0)
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from hashlib import blake2b
 from math import hypot, isfinite
-from typing import Iterable, List, Optional, Tuple
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 
-@dataclass(frozen=True)
+from ._numba_core import reconstruct_core
+
+# The 8 moves as (dc, dr), in the order `neighbors8` yields them.
+_MOVES: Tuple[Tuple[int, int], ...] = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+@dataclass(frozen=True, slots=True)
 class AlgorithmSpec:
     """Metadata for an algorithm plugin."""
 
@@ -14,7 +22,7 @@ class AlgorithmSpec:
     description: str = ""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GridBoundsMeters:
     """Bounds of the planning area in Web Mercator meters (EPSG:3857)."""
 
@@ -24,13 +32,26 @@ class GridBoundsMeters:
     max_y: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RunOptions:
     return_visited: bool = False
     max_visited: int = 50000
-
-
-@dataclass
+    # False lets algorithms that support it trade exact float costs for
+    # faster fixed-point arithmetic (the path may differ on near-ties).
+    exact: bool = True
+    # Reuse the result of an identical earlier run (same algorithm, problem
+    # and options) instead of searching again. See `loader.load_plugins`.
+    cache: bool = False
+    # Theta* turn-penalty knobs; None keeps the plugin's top-of-file default.
+    # See `plugins/thetastar.py`.
+    turn_weight: Optional[float] = None
+    turn_power: Optional[float] = None
+    u_turn_mult: Optional[float] = None
+    u_turn_threshold_rad: Optional[float] = None
+    turn_exact: bool = False
+
+
+@dataclass(slots=True)
 class GridProblem:
     """A single-source single-target grid routing problem.
 
@@ -50,8 +71,144 @@ class GridProblem:
     bounds: GridBoundsMeters
     start: int
     goal: int
-    blocked: List[bool]
-    cost_multiplier: List[float]
+    # Lists or 1-D NumPy arrays of length width*height.
+    blocked: Union[List[bool], np.ndarray]
+    cost_multiplier: Union[List[float], np.ndarray]
+
+    # Flat NumPy views for compiled kernels (see `_numba_core.py`). Built once
+    # per problem; `multiplier_f32` is already sanitized like `get_multiplier`.
+    blocked_u8: np.ndarray = field(init=False, repr=False, compare=False)
+    # The same flags packed 8 cells per byte, least significant bit first
+    # (cell i is bit i & 7 of byte i >> 3); see `_numba_core.is_blocked`.
+    blocked_bits: np.ndarray = field(init=False, repr=False, compare=False)
+    multiplier_f32: np.ndarray = field(init=False, repr=False, compare=False)
+
+    # Per-cell lookup tables behind the `col_of`/`row_of`/`cx_of`/`cy_of`
+    # properties; built on first access, since most algorithms never use them.
+    _cell_tables: Optional[Tuple[np.ndarray, ...]] = field(default=None, init=False, repr=False, compare=False)
+
+    # Cell-id offsets and step distances of the 8 moves, in `neighbors8` order.
+    # Only valid for interior cells (not on the grid border).
+    neighbor_offsets: np.ndarray = field(init=False, repr=False, compare=False)
+    neighbor_dists: np.ndarray = field(init=False, repr=False, compare=False)
+    _neighbor_table: Tuple[Tuple[int, float], ...] = field(init=False, repr=False, compare=False)
+
+    # Blocked flags as bytes and sanitized multipliers as a plain list for the
+    # pure-Python helpers (indexing either is much cheaper than a NumPy array).
+    # The list is built on first use (see `_multipliers`): compiled kernels
+    # never need it, and boxing every cell costs more than the search itself
+    # on large grids.
+    _blocked_bytes: bytes = field(init=False, repr=False, compare=False)
+    _multiplier_list: Optional[List[float]] = field(default=None, init=False, repr=False, compare=False)
+    _min_multiplier: float = field(init=False, repr=False, compare=False)
+
+    # Backing fields of the lazy `multiplier_q8` property (None is a valid value).
+    _multiplier_q8: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _multiplier_q8_built: bool = field(default=False, init=False, repr=False, compare=False)
+
+    # Digest of the blocked/multiplier grids, computed on first `cache_key` call.
+    _content_hash: Optional[Tuple[bytes, bytes]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.blocked_u8 = np.asarray(self.blocked, dtype=np.uint8)
+        self._blocked_bytes = self.blocked_u8.tobytes()
+        self.blocked_bits = np.packbits(self.blocked_u8 != 0, bitorder="little")
+        mult = self._sanitized_multipliers()
+        self._min_multiplier = float(mult.min()) if mult.size else 1.0
+        self.multiplier_f32 = mult.astype(np.float32)
+
+        w = self.width
+        cs = self.cell_size_m
+        diag = cs * 2**0.5
+        self.neighbor_offsets = np.array([1, -1, w, -w, w + 1, -w + 1, w - 1, -w - 1], dtype=np.int32)
+        self.neighbor_dists = np.array([cs, cs, cs, cs, diag, diag, diag, diag], dtype=np.float64)
+        self._neighbor_table = tuple(zip(self.neighbor_offsets.tolist(), self.neighbor_dists.tolist()))
+
+    def __reduce__(self):
+        # Pickle only the constructor fields; the derived tables are rebuilt by
+        # __post_init__ on load, which is cheaper than shipping them (e.g. to a
+        # worker process).
+        fields = (self.width, self.height, self.cell_size_m, self.bounds, self.start, self.goal)
+        return type(self), (*fields, self.blocked, self.cost_multiplier)
+
+    def cache_key(self) -> Tuple:
+        """Hashable key identifying this problem by value.
+
+        Two problems with equal keys have the same grid, endpoints and
+        multipliers, so any algorithm returns the same result for both.
+        """
+        if self._content_hash is None:
+            # Hash the multipliers in their own dtype (float32 from the API),
+            # so contiguous array inputs are hashed in place without a copy.
+            # The dtype goes into the digest: equal values in another dtype
+            # just miss the cache.
+            mult = np.ascontiguousarray(self.cost_multiplier)
+            mult_hash = blake2b(mult.dtype.str.encode(), digest_size=16)
+            mult_hash.update(mult)
+            self._content_hash = (
+                blake2b(np.ascontiguousarray(self.blocked_u8), digest_size=16).digest(),
+                mult_hash.digest(),
+            )
+        return (self.width, self.height, self.cell_size_m, self.bounds, self.start, self.goal, *self._content_hash)
+
+    @property
+    def col_of(self) -> np.ndarray:
+        """Column of every cell, indexed by cell id."""
+        return self._cell_table(0)
+
+    @property
+    def row_of(self) -> np.ndarray:
+        """Row of every cell, indexed by cell id."""
+        return self._cell_table(1)
+
+    @property
+    def cx_of(self) -> np.ndarray:
+        """Cell-center x in Web Mercator meters (as `cell_center_m`), by cell id."""
+        return self._cell_table(2)
+
+    @property
+    def cy_of(self) -> np.ndarray:
+        """Cell-center y in Web Mercator meters (as `cell_center_m`), by cell id."""
+        return self._cell_table(3)
+
+    def _cell_table(self, i: int) -> np.ndarray:
+        if self._cell_tables is None:
+            ids = np.arange(self.width * self.height, dtype=np.int32)
+            row_of = ids // self.width
+            col_of = ids - row_of * self.width
+            cx_of = self.bounds.min_x + (col_of + 0.5) * self.cell_size_m
+            cy_of = self.bounds.min_y + (row_of + 0.5) * self.cell_size_m
+            self._cell_tables = (col_of, row_of, cx_of, cy_of)
+        return self._cell_tables[i]
+
+    @property
+    def multiplier_q8(self) -> Optional[np.ndarray]:
+        """Multipliers in int16 fixed point (units of 1/256), built on first use.
+
+        Only kernels run with `RunOptions(exact=False)` read these. None if
+        some multiplier doesn't fit (>= 128).
+        """
+        if not self._multiplier_q8_built:
+            mult_q = np.round(self._sanitized_multipliers() * 256.0)
+            if mult_q.size and mult_q.max() > np.iinfo(np.int16).max:
+                self._multiplier_q8 = None
+            else:
+                # Tiny multipliers would round to 0 and make edges free.
+                self._multiplier_q8 = np.maximum(mult_q, 1).astype(np.int16)
+            self._multiplier_q8_built = True
+        return self._multiplier_q8
+
+    def _sanitized_multipliers(self) -> np.ndarray:
+        """`cost_multiplier` as float64, with invalid entries set to 1.0 (see `get_multiplier`)."""
+        mult = np.asarray(self.cost_multiplier, dtype=np.float64)
+        return np.where(np.isfinite(mult) & (mult > 0), mult, 1.0)
+
+    def _multipliers(self) -> List[float]:
+        """Sanitized multipliers as a list (see `get_multiplier`), built on first use."""
+        mult = self._multiplier_list
+        if mult is None:
+            mult = self._multiplier_list = self._sanitized_multipliers().tolist()
+        return mult
 
     def size(self) -> int:
         return self.width * self.height
@@ -81,41 +238,70 @@ class GridProblem:
         return x, y
 
     def is_blocked(self, cell_id: int) -> bool:
-        return bool(self.blocked[cell_id])
+        return bool(self._blocked_bytes[cell_id])
 
     def get_multiplier(self, cell_id: int) -> float:
-        m = self.cost_multiplier[cell_id]
-        if not isfinite(m) or m <= 0:
-            return 1.0
-        return float(m)
+        """Multiplier of a cell; non-finite or non-positive values count as 1.0."""
+        return self._multipliers()[cell_id]
+
+    def min_multiplier(self) -> float:
+        """Smallest multiplier `get_multiplier` can return (precomputed).
+
+        Invalid entries (NaN, inf, <= 0) count as 1.0, as in `get_multiplier`,
+        so this is always finite and positive and scales an admissible
+        heuristic even when the raw grid holds NaN or zeros.
+        """
+        return self._min_multiplier
 
     def step_cost(self, to_id: int, step_distance_m: float) -> float:
-        return float(step_distance_m) * self.get_multiplier(to_id)
+        return float(step_distance_m) * self._multipliers()[to_id]
 
     def neighbors8(self, cell_id: int) -> Iterable[Tuple[int, float]]:
         """Yield (neighbor_id, step_distance_m) for free (non-blocked) neighbors."""
-        col, row = self.to_row_col(cell_id)
-        cs = self.cell_size_m
-        # (dc, dr, distance_multiplier)
-        dirs = (
-            (1, 0, 1.0),
-            (-1, 0, 1.0),
-            (0, 1, 1.0),
-            (0, -1, 1.0),
-            (1, 1, 2**0.5),
-            (1, -1, 2**0.5),
-            (-1, 1, 2**0.5),
-            (-1, -1, 2**0.5),
-        )
-        for dc, dr, mult in dirs:
-            c = col + dc
-            r = row + dr
-            if not self.in_bounds(c, r):
-                continue
-            nid = self.to_id(c, r)
-            if self.is_blocked(nid):
-                continue
-            yield nid, cs * mult
+        w = self.width
+        row = cell_id // w
+        col = cell_id - row * w
+        blocked = self._blocked_bytes
+        if 0 < col < w - 1 and 0 < row < self.height - 1:
+            # Interior cell (the vast majority): all 8 moves are in bounds.
+            for offset, dist in self._neighbor_table:
+                nid = cell_id + offset
+                if not blocked[nid]:
+                    yield nid, dist
+            return
+
+        # Border cell: bounds-check each move.
+        h = self.height
+        for (dc, dr), (offset, dist) in zip(_MOVES, self._neighbor_table):
+            if 0 <= col + dc < w and 0 <= row + dr < h:
+                nid = cell_id + offset
+                if not blocked[nid]:
+                    yield nid, dist
+
+    def neighbors8_cost(self, cell_id: int) -> Iterable[Tuple[int, float, float]]:
+        """Yield (neighbor_id, step_distance_m, step_cost) for free neighbors.
+
+        Same neighbors and order as `neighbors8`, with `step_cost` already
+        applied, so search loops don't need a second call per neighbor.
+        """
+        mult = self._multipliers()
+        w = self.width
+        row = cell_id // w
+        col = cell_id - row * w
+        blocked = self._blocked_bytes
+        if 0 < col < w - 1 and 0 < row < self.height - 1:
+            for offset, dist in self._neighbor_table:
+                nid = cell_id + offset
+                if not blocked[nid]:
+                    yield nid, dist, dist * mult[nid]
+            return
+
+        h = self.height
+        for (dc, dr), (offset, dist) in zip(_MOVES, self._neighbor_table):
+            if 0 <= col + dc < w and 0 <= row + dr < h:
+                nid = cell_id + offset
+                if not blocked[nid]:
+                    yield nid, dist, dist * mult[nid]
 
     def heuristic_euclidean_m(self, cell_id: int, min_multiplier: Optional[float] = None) -> float:
         """Admissible Euclidean heuristic in meters.
@@ -136,28 +322,52 @@ class GridProblem:
         return base * float(min_multiplier)
 
 
-@dataclass
+@dataclass(slots=True)
 class AlgorithmResult:
-    path: List[int]
-    visited: List[int]
+    # Lists or 1-D integer NumPy arrays; the API serializes both directly.
+    path: Union[List[int], np.ndarray]
+    visited: Union[List[int], np.ndarray]
     expanded: int
     cost: float
+    # Wall time of the plugin's `run` alone, set by the loader where it runs
+    # (in the worker process, if any); plugins leave it unset.
+    runtime_ms: Optional[float] = None
+
+
+@dataclass(frozen=True, slots=True)
+class AlgorithmError:
+    """Returned instead of an AlgorithmResult when a plugin's `run` raised.
+
+    `loader` converts exceptions at the call boundary (inside the worker
+    process, if any), so callers check the type instead of catching, and
+    plugin exceptions never have to be pickled.
+    """
+
+    error_type: str
+    message: str
 
 
-def reconstruct_path(came_from: List[int], start: int, goal: int) -> List[int]:
+def reconstruct_path(came_from: Union[Sequence[int], np.ndarray], start: int, goal: int) -> List[int]:
+    """Follow parent pointers from goal back to start.
+
+    `came_from` may be a list or a NumPy array (-1 = no parent). Arrays are
+    walked by a compiled kernel into a preallocated buffer. `came_from[start]`
+    is never read, so it may hold -1 or `start` itself.
+    """
     if goal < 0 or goal >= len(came_from):
         return []
     if came_from[goal] == -1 and goal != start:
         return []
+    if isinstance(came_from, np.ndarray):
+        return reconstruct_core(came_from, start, goal).tolist()
     out: List[int] = []
     cur = goal
-    while True:
+    while cur != start:
         out.append(cur)
-        if cur == start:
-            break
         cur = came_from[cur]
-        if cur == -1:
+        if cur < 0:
             return []
+    out.append(start)
     out.reverse()
     return out
 
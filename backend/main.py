@@ -1,28 +1,138 @@
 from __future__ import annotations
 
-import time
-from typing import List, Optional
-
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+import base64
+import binascii
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Annotated, Any, Iterator, List, Optional, Union
+
+import msgspec
+import numpy as np
+import orjson
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from .algorithms.loader import load_plugins, list_algorithms, warm_up, warm_up_worker
+from .algorithms.types import AlgorithmError, GridBoundsMeters, GridProblem, RunOptions
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson (NumPy arrays and scalars allowed).
+
+    Handlers return this directly with plain dicts/lists, so FastAPI skips
+    `jsonable_encoder` and response-model validation; the `response_model`
+    declarations below only document the shape in the OpenAPI schema.
+    Non-finite floats (e.g. the cost of an unreachable goal) become null.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+app = FastAPI(
+    title="Stanford UAV Nav Suite Backend",
+    version="0.2.0",
+    default_response_class=ORJSONResponse,
+)
 
-from .algorithms.loader import load_plugins, list_algorithms
-from .algorithms.types import AlgorithmResult, GridBoundsMeters, GridProblem, RunOptions
 
+class _AllowAllCORS:
+    """Minimal ASGI CORS layer: any origin, any method/header, credentials allowed.
+
+    Same policy as Starlette's CORSMiddleware(allow_origins=["*"],
+    allow_credentials=True, allow_methods=["*"], allow_headers=["*"]), without
+    its per-request policy checks: preflights are answered straight from a
+    precomputed header list and other responses only get the origin echoed.
+    """
+
+    _PREFLIGHT_HEADERS = [
+        (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+        (b"access-control-allow-credentials", b"true"),
+        (b"access-control-max-age", b"600"),
+        (b"vary", b"Origin"),
+        (b"content-length", b"0"),
+    ]
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        origin = None
+        request_headers = None
+        is_preflight = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                is_preflight = True
+            elif name == b"access-control-request-headers":
+                request_headers = value
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if is_preflight and scope["method"] == "OPTIONS":
+            headers = [(b"access-control-allow-origin", origin), *self._PREFLIGHT_HEADERS]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"access-control-allow-origin", origin),
+                    (b"access-control-allow-credentials", b"true"),
+                    (b"vary", b"Origin"),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
+# In dev, the frontend uses a Vite proxy. This CORS layer is just extra safety.
+app.add_middleware(_AllowAllCORS)
 
-app = FastAPI(title="Stanford UAV Nav Suite Backend", version="0.2.0")
+REGISTRY = load_plugins()
+# Compile/load the JIT kernels now rather than inside the first timed request.
+warm_up(REGISTRY)
 
-# In dev, the frontend uses a Vite proxy. This CORS config is just extra safety.
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# REGISTRY is fixed for the life of the process, so /api/algorithms serves
+# these pre-serialized bytes as-is (async: no thread-pool hop either).
+_ALGORITHMS_JSON = orjson.dumps(
+    [{"id": spec.id, "name": spec.name, "description": spec.description} for spec in list_algorithms(REGISTRY)]
 )
 
-REGISTRY = load_plugins()
+# /api/run responses with more visited cells than this are streamed in chunks
+# of STREAM_CHUNK_ITEMS ids; below it, streaming costs more than it saves.
+STREAM_MIN_VISITED = 10_000
+STREAM_CHUNK_ITEMS = 4096
+
+# Problems with at least this many cells are searched in a worker process.
+PROCESS_POOL_MIN_CELLS = 250_000
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    """Process pool for large searches, started on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the server process runs threads.
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(), mp_context=mp.get_context("spawn"), initializer=warm_up_worker
+            )
+        return _pool
 
 
 class AlgorithmInfo(BaseModel):
@@ -31,30 +141,76 @@ class AlgorithmInfo(BaseModel):
     description: str = ""
 
 
-class GridBoundsMetersModel(BaseModel):
+# Request bodies are msgspec Structs, decoded and validated in one C pass
+# (see `run`); responses stay Pydantic models, used for the OpenAPI schema.
+PositiveInt = Annotated[int, msgspec.Meta(gt=0)]
+NonNegativeInt = Annotated[int, msgspec.Meta(ge=0)]
+
+
+class GridBoundsMetersModel(msgspec.Struct):
     min_x: float
     min_y: float
     max_x: float
     max_y: float
 
 
-class GridProblemModel(BaseModel):
-    width: int = Field(gt=0)
-    height: int = Field(gt=0)
-    cell_size_m: float = Field(gt=0)
+class GridProblemModel(msgspec.Struct, dict=True):
+    width: PositiveInt
+    height: PositiveInt
+    cell_size_m: Annotated[float, msgspec.Meta(gt=0)]
     bounds: GridBoundsMetersModel
-    start: int = Field(ge=0)
-    goal: int = Field(ge=0)
-    blocked: List[int]
-    cost_multiplier: List[float]
+    start: NonNegativeInt
+    goal: NonNegativeInt
+    # Each grid is sent either as a JSON list or, for large grids, base64 in
+    # the matching *_b64 field (skips per-element validation entirely):
+    # - blocked_b64: row-major blocked flags packed 8 per byte, first cell in
+    #   the most significant bit (numpy.packbits order), ceil(n/8) bytes.
+    # - cost_multiplier_b64: little-endian float32 values, 4*n bytes.
+    # JSON booleans or 0/1 ints, as the original Pydantic model accepted.
+    blocked: Optional[List[Union[bool, int]]] = None
+    cost_multiplier: Optional[List[float]] = None
+    blocked_b64: Optional[str] = None
+    cost_multiplier_b64: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        # Runs inside the decoder, so a malformed problem is rejected (422)
+        # before reaching the handler. `n` goes in the instance __dict__
+        # (dict=True) rather than a field, so it is never read from the
+        # request body. The base64 lengths are checked after decoding.
+        n = self.width * self.height
+        if self.start >= n or self.goal >= n:
+            raise ValueError("start/goal out of bounds")
+        if (self.blocked is None) == (self.blocked_b64 is None):
+            raise ValueError("Provide exactly one of blocked / blocked_b64")
+        if (self.cost_multiplier is None) == (self.cost_multiplier_b64 is None):
+            raise ValueError("Provide exactly one of cost_multiplier / cost_multiplier_b64")
+        if self.blocked is not None and len(self.blocked) != n:
+            raise ValueError(f"blocked length {len(self.blocked)} != width*height {n}")
+        if self.cost_multiplier is not None and len(self.cost_multiplier) != n:
+            raise ValueError(f"cost_multiplier length {len(self.cost_multiplier)} != width*height {n}")
+        self.n = n
+
+
+class RunOptionsModel(msgspec.Struct):
+    return_visited: bool = False
+    max_visited: NonNegativeInt = 50000
+    exact: bool = True
+    # Opt-in: a cache hit skips the search and reports the runtime_ms of the
+    # run that produced it, which a client comparing runtimes must know about.
+    cache: bool = False
+    # Theta* turn-penalty overrides (same names as RunOptions).
+    turn_weight: Optional[float] = None
+    turn_power: Optional[float] = None
+    u_turn_mult: Optional[float] = None
+    u_turn_threshold_rad: Optional[float] = None
+    turn_exact: bool = False
 
 
-class RunOptionsModel(BaseModel):
-    return_visited: bool = False
-    max_visited: int = Field(default=50000, ge=0)
+# Shared by every request that omits "options"; RunOptions is frozen.
+_DEFAULT_RUN_OPTS = RunOptions(**msgspec.structs.asdict(RunOptionsModel()))
 
 
-class RunRequestModel(BaseModel):
+class RunRequestModel(msgspec.Struct):
     algorithm_id: str
     problem: GridProblemModel
     options: Optional[RunOptionsModel] = None
@@ -68,36 +224,107 @@ class RunResponseModel(BaseModel):
     runtime_ms: float
 
 
+def _decode_grids(p: GridProblemModel) -> tuple[np.ndarray, np.ndarray]:
+    """Return (blocked, cost_multiplier) arrays from the list or base64 fields.
+
+    Which fields are set and the list lengths were already checked by
+    GridProblemModel.__post_init__.
+    """
+    n = p.n
+    if p.blocked is not None:
+        # bytes() packs the 0/1 ints (or bools) in one C loop (several times faster than
+        # np.asarray on a list) and rejects anything outside 0..255; the
+        # range check is then a single vectorized pass.
+        try:
+            blocked = np.frombuffer(bytes(p.blocked), dtype=np.uint8)
+        except ValueError:
+            blocked = None
+        if blocked is None or blocked.max() > 1:
+            raise HTTPException(status_code=400, detail="blocked values must be 0 or 1")
+    else:
+        raw = _b64decode(p.blocked_b64, "blocked_b64")
+        if len(raw) != (n + 7) // 8:
+            raise HTTPException(
+                status_code=400, detail=f"blocked_b64 has {len(raw)} bytes, expected {(n + 7) // 8}"
+            )
+        blocked = np.unpackbits(np.frombuffer(raw, dtype=np.uint8), count=n).astype(np.bool_)
+
+    if p.cost_multiplier is not None:
+        # float32, like the base64 form: 4 bytes per cell, and the same
+        # precision the compiled kernels already use (GridProblem.multiplier_f32).
+        with np.errstate(over="ignore"):
+            cost_multiplier = np.asarray(p.cost_multiplier, dtype=np.float32)
+        # JSON has no inf, so an inf here is a finite value beyond float32's
+        # range; GridProblem would treat it as 1.0. Clip to the largest float32
+        # instead, keeping "very expensive" meaning very expensive.
+        if np.isinf(cost_multiplier).any():
+            f32_max = np.finfo(np.float32).max
+            cost_multiplier = np.clip(np.asarray(p.cost_multiplier, dtype=np.float64), -f32_max, f32_max)
+            cost_multiplier = cost_multiplier.astype(np.float32)
+    else:
+        raw = _b64decode(p.cost_multiplier_b64, "cost_multiplier_b64")
+        if len(raw) != 4 * n:
+            raise HTTPException(
+                status_code=400, detail=f"cost_multiplier_b64 has {len(raw)} bytes, expected {4 * n}"
+            )
+        cost_multiplier = np.frombuffer(raw, dtype="<f4")
+
+    return blocked, cost_multiplier
+
+
+def _b64decode(data: str, field_name: str) -> bytes:
+    try:
+        return base64.b64decode(data, validate=True)
+    except binascii.Error as e:
+        raise HTTPException(status_code=400, detail=f"{field_name} is not valid base64: {e}")
+
+
 @app.get("/api/health")
 def health():
     return {"ok": True, "algorithms": len(REGISTRY)}
 
 
 @app.get("/api/algorithms", response_model=list[AlgorithmInfo])
-def algorithms() -> list[AlgorithmInfo]:
-    out: list[AlgorithmInfo] = []
-    for spec in list_algorithms(REGISTRY):
-        out.append(AlgorithmInfo(id=spec.id, name=spec.name, description=spec.description))
-    return out
+async def algorithms() -> Response:
+    return Response(_ALGORITHMS_JSON, media_type="application/json")
+
+
+# Built once: a Decoder holds the compiled type for RunRequestModel, where
+# msgspec.json.decode(..., type=...) has to look it up on every call.
+_RUN_REQUEST_DECODER = msgspec.json.Decoder(RunRequestModel)
+
+# msgspec schemas for the OpenAPI docs, since FastAPI only introspects Pydantic.
+(_RUN_REQUEST_SCHEMA,), _RUN_REQUEST_COMPONENTS = msgspec.json.schema_components(
+    [RunRequestModel], ref_template="#/components/schemas/{name}"
+)
+
+
+@app.post(
+    "/api/run",
+    response_model=RunResponseModel,
+    openapi_extra={
+        "requestBody": {"required": True, "content": {"application/json": {"schema": _RUN_REQUEST_SCHEMA}}}
+    },
+)
+async def run(request: Request) -> ORJSONResponse:
+    try:
+        req = _RUN_REQUEST_DECODER.decode(await request.body())
+    except msgspec.ValidationError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    # The search is CPU-bound; keep it off the event loop.
+    return await run_in_threadpool(_run, req)
 
 
-@app.post("/api/run", response_model=RunResponseModel)
-def run(req: RunRequestModel) -> RunResponseModel:
+def _run(req: RunRequestModel) -> ORJSONResponse:
     algo = REGISTRY.get(req.algorithm_id)
     if algo is None:
         raise HTTPException(status_code=404, detail=f"Unknown algorithm_id: {req.algorithm_id}")
 
     p = req.problem
-    n = p.width * p.height
-    if len(p.blocked) != n:
-        raise HTTPException(status_code=400, detail=f"blocked length {len(p.blocked)} != width*height {n}")
-    if len(p.cost_multiplier) != n:
-        raise HTTPException(
-            status_code=400,
-            detail=f"cost_multiplier length {len(p.cost_multiplier)} != width*height {n}",
-        )
-    if p.start >= n or p.goal >= n:
-        raise HTTPException(status_code=400, detail="start/goal out of bounds")
+    n = p.n
+    blocked, cost_multiplier = _decode_grids(p)
 
     bounds = GridBoundsMeters(
         min_x=p.bounds.min_x,
@@ -106,8 +333,6 @@ def run(req: RunRequestModel) -> RunResponseModel:
         max_y=p.bounds.max_y,
     )
 
-    blocked_bool = [bool(x) for x in p.blocked]
-
     problem = GridProblem(
         width=p.width,
         height=p.height,
@@ -115,29 +340,93 @@ def run(req: RunRequestModel) -> RunResponseModel:
         bounds=bounds,
         start=p.start,
         goal=p.goal,
-        blocked=blocked_bool,
-        cost_multiplier=list(map(float, p.cost_multiplier)),
+        blocked=blocked,
+        cost_multiplier=cost_multiplier,
     )
 
-    opts = req.options or RunOptionsModel()
-    run_opts = RunOptions(return_visited=opts.return_visited, max_visited=opts.max_visited)
-
-    t0 = time.perf_counter()
-    try:
-        result: AlgorithmResult = algo.run(problem, run_opts)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Algorithm crashed: {type(e).__name__}: {e}")
-    t1 = time.perf_counter()
-
-    runtime_ms = (t1 - t0) * 1000.0
-
-    # Ensure visited is empty if not requested (some algos might still populate it).
-    visited = result.visited if run_opts.return_visited else []
-
-    return RunResponseModel(
-        path=result.path,
-        visited=visited,
-        expanded=int(result.expanded),
-        cost=float(result.cost),
-        runtime_ms=runtime_ms,
+    opts = req.options
+    run_opts = _DEFAULT_RUN_OPTS if opts is None else RunOptions(**msgspec.structs.asdict(opts))
+
+    # Large searches go to a process pool so several can run on separate
+    # cores; small ones stay on this thread, where pickling would dominate.
+    executor = _process_pool() if n >= PROCESS_POOL_MIN_CELLS else None
+
+    result = algo.run(problem, run_opts, executor=executor)
+    if isinstance(result, AlgorithmError):
+        raise HTTPException(status_code=500, detail=f"Algorithm crashed: {result.error_type}: {result.message}")
+
+    # Measured around the plugin call itself (see loader._run_guarded), so a
+    # process-pool run doesn't count pickling, IPC or worker start-up.
+    runtime_ms = result.runtime_ms
+
+    # Ensure visited is empty if not requested (some algos might still populate it),
+    # and never longer than max_visited. Slicing an array is a view; a list only
+    # copies the kept prefix.
+    visited = result.visited[: run_opts.max_visited] if run_opts.return_visited else []
+
+    content = {
+        "path": result.path,
+        "visited": visited,
+        "expanded": int(result.expanded),
+        "cost": float(result.cost),
+        "runtime_ms": runtime_ms,
+    }
+    if len(visited) > STREAM_MIN_VISITED:
+        return StreamingResponse(_stream_json(content), media_type="application/json")
+    return ORJSONResponse(content)
+
+
+def _stream_json(content: dict[str, Any]) -> Iterator[bytes]:
+    """Yield `content` as a JSON object, large list/array values in chunks.
+
+    Produces the same document as ORJSONResponse without materializing it
+    in a single buffer.
+    """
+    opt = orjson.OPT_SERIALIZE_NUMPY
+    sep = b"{"
+    for key, value in content.items():
+        yield sep + orjson.dumps(key) + b":"
+        sep = b","
+        if isinstance(value, (list, np.ndarray)) and len(value) > STREAM_CHUNK_ITEMS:
+            yield b"["
+            for i in range(0, len(value), STREAM_CHUNK_ITEMS):
+                chunk = orjson.dumps(value[i : i + STREAM_CHUNK_ITEMS], option=opt)[1:-1]
+                yield chunk if i == 0 else b"," + chunk
+            yield b"]"
+        else:
+            yield orjson.dumps(value, option=opt)
+    yield b"}"
+
+
+_default_openapi = app.openapi
+
+
+def _openapi() -> dict[str, Any]:
+    """FastAPI's schema plus the msgspec request components referenced by /api/run."""
+    if app.openapi_schema is None:
+        schema = _default_openapi()
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(_RUN_REQUEST_COMPONENTS)
+    return app.openapi_schema
+
+
+app.openapi = _openapi  # type: ignore[method-assign]
+
+
+if __name__ == "__main__":
+    # Production-style start: `python -m backend.main`. Pins uvicorn to the libuv
+    # event loop and the C HTTP parser (both installed by uvicorn[standard];
+    # uvloop has no Windows build). `app` is passed as an object, not an import
+    # string: without reload/workers a string would import this module a second
+    # time as `backend.main` and build the app twice. The process-pool workers
+    # re-import this module under a different name, so they never reach this block.
+    import sys
+
+    import uvicorn
+
+    uvicorn.run(
+        app,
+        host=os.environ.get("HOST", "127.0.0.1"),
+        port=int(os.environ.get("PORT", "8000")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
     )